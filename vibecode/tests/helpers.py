@@ -0,0 +1,7 @@
+"""Shared constants for the integration tests."""
+
+# Headers for MCP requests over streamable HTTP, which may answer with JSON or SSE
+MCP_HEADERS = {
+    "Content-Type": "application/json",
+    "Accept": "application/json, text/event-stream"
+}
@@ -14,6 +14,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from vibecode.server import AuthenticatedMCPServer
 
+from tests.helpers import MCP_HEADERS
+
 
 class TestAllToolsIntegration:
     """Comprehensive integration tests for all MCP tools via real HTTP protocol.
@@ -58,10 +60,7 @@ class TestAllToolsIntegration:
         # Initialize the MCP session
         init_response = requests.post(
             f"http://127.0.0.1:{port}/all-tools/",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "init",
@@ -81,10 +80,7 @@ class TestAllToolsIntegration:
         """Execute a tool via MCP protocol and return the result."""
         response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": test_id,
@@ -342,10 +338,7 @@ if __name__ == "__main__":
         # Make a tools/list request
         response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "tools-list-test",
@@ -384,10 +377,7 @@ if __name__ == "__main__":
         # Step 1: Initialize (same as in server_setup, but verify again)
         init_response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "workflow-init",
@@ -404,10 +394,7 @@ if __name__ == "__main__":
         # Step 2: List tools (critical for Claude.ai discovery)
         tools_response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "workflow-tools",
@@ -421,10 +408,7 @@ if __name__ == "__main__":
         with tempfile.TemporaryDirectory() as temp_dir:
             execute_response = requests.post(
                 endpoint,
-                headers={
-                    "Content-Type": "application/json",
-                    "Accept": "application/json, text/event-stream"
-                },
+                headers=MCP_HEADERS,
                 json={
                     "jsonrpc": "2.0",
                     "id": "workflow-execute",
@@ -471,10 +455,7 @@ if __name__ == "__main__":
         # Get tools list
         response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "schema-test",
@@ -612,10 +593,7 @@ if __name__ == "__main__":
         # Get tools list
         response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "all-tools-test",
@@ -672,10 +650,7 @@ if __name__ == "__main__":
         # Get tools list to analyze schema extraction robustness
         response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "edge-case-test",
@@ -736,10 +711,7 @@ if __name__ == "__main__":
         # Step 1: Initialize (exact claude.ai request)
         init_response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "claude-ai-init",
@@ -758,10 +730,7 @@ if __name__ == "__main__":
         # Step 2: Get tools list (this was throwing the TypeError)
         tools_response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json", 
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "claude-ai-tools",
@@ -808,10 +777,7 @@ if __name__ == "__main__":
         # Step 4: Try to call directory_tree (this would have failed before)
         call_response = requests.post(
             endpoint,
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0", 
                 "id": "claude-ai-call",
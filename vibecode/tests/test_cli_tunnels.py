@@ -0,0 +1,155 @@
+"""Tests for the cloudflared tunnel helpers in vibecode.cli."""
+
+import json
+import os
+import sys
+import time
+from pathlib import Path
+
+import pytest
+
+sys.path.insert(0, str(Path(__file__).parent.parent))
+
+from vibecode import cli
+
+
+def test_parse_tunnel_list_json():
+    """Tunnel names map to ids from `cloudflared tunnel list --output json`."""
+    output = '[{"id": "abc-1", "name": "vibecode-123"}, {"id": "abc-2", "name": "other"}]'
+    assert cli._parse_tunnel_list(output) == {"vibecode-123": "abc-1", "other": "abc-2"}
+
+
+def test_parse_tunnel_list_text_table():
+    """Plain text output is read from the table below the ID header."""
+    output = (
+        "You can obtain more detailed information for each tunnel with `cloudflared tunnel info <name/uuid>`\n"
+        "ID                                   NAME          CREATED              CONNECTIONS\n"
+        "abc-1                                vibecode-123  2024-01-01T00:00:00Z\n"
+    )
+    assert cli._parse_tunnel_list(output) == {"vibecode-123": "abc-1"}
+
+
+def test_parse_tunnel_list_unexpected_json():
+    """JSON that is not a list of tunnel objects yields no tunnels instead of crashing."""
+    assert cli._parse_tunnel_list('{"a": 1}') == {}
+    assert cli._parse_tunnel_list('["x", 1, null]') == {}
+    assert cli._parse_tunnel_list('null') == {}
+
+
+@pytest.fixture
+def tunnel_env(tmp_path, monkeypatch):
+    """Point the CLI's config, cloudflared directory and tunnel cache into tmp_path."""
+    project = tmp_path / "project"
+    project.mkdir()
+    monkeypatch.chdir(project)
+    
+    cloudflared_dir = tmp_path / ".cloudflared"
+    cloudflared_dir.mkdir()
+    (cloudflared_dir / "cert.pem").write_text("cert")
+    monkeypatch.delenv("TUNNEL_ORIGIN_CERT", raising=False)
+    monkeypatch.setattr(cli, "_CLOUDFLARED_DIR", cloudflared_dir)
+    monkeypatch.setattr(cli, "_CLOUDFLARED_CONFIG_DIRS", (cloudflared_dir,))
+    monkeypatch.setattr(cli, "_TUNNEL_LIST_CACHE_PATH", tmp_path / "cache" / "tunnels.json")
+    
+    cli.get_vibecode_config_path.cache_clear()
+    cli._tunnel_inventory.cache_clear()
+    cli._CONFIG_CACHE.clear()
+    yield cloudflared_dir
+    cli.get_vibecode_config_path.cache_clear()
+    cli._tunnel_inventory.cache_clear()
+    cli._CONFIG_CACHE.clear()
+
+
+def write_resolved_tunnel(entry):
+    """Store a resolved_tunnel entry in .vibecode.json as an earlier start would have."""
+    Path(".vibecode.json").write_text(json.dumps({"uuid": "u", "resolved_tunnel": entry}))
+    cli._CONFIG_CACHE.clear()
+
+
+class TestLoadResolvedTunnel:
+    """Reuse rules for the tunnel remembered in .vibecode.json."""
+    
+    def test_without_id_reused_within_ttl(self, tunnel_env):
+        write_resolved_tunnel({"name": "vibecode-1", "resolved_at": time.time()})
+        assert cli.load_resolved_tunnel() == "vibecode-1"
+    
+    def test_without_id_expires_after_ttl(self, tunnel_env):
+        old = time.time() - cli._RESOLVED_TUNNEL_TTL - 1
+        write_resolved_tunnel({"name": "vibecode-1", "resolved_at": old})
+        assert cli.load_resolved_tunnel() is None
+    
+    def test_with_id_requires_credentials_file(self, tunnel_env):
+        write_resolved_tunnel({"name": "vibecode-1", "id": "abc", "resolved_at": time.time()})
+        assert cli.load_resolved_tunnel() is None
+    
+    def test_with_credentials_reused_beyond_ttl(self, tunnel_env):
+        (tunnel_env / "abc.json").write_text("{}")
+        old = time.time() - cli._RESOLVED_TUNNEL_TTL - 1
+        write_resolved_tunnel({"name": "vibecode-1", "id": "abc", "resolved_at": old})
+        assert cli.load_resolved_tunnel() == "vibecode-1"
+    
+    def test_with_credentials_expires_after_max_age(self, tunnel_env):
+        (tunnel_env / "abc.json").write_text("{}")
+        old = time.time() - cli._RESOLVED_TUNNEL_MAX_AGE - 1
+        write_resolved_tunnel({"name": "vibecode-1", "id": "abc", "resolved_at": old})
+        assert cli.load_resolved_tunnel() is None
+    
+    def test_reset_uuid_forgets_tunnel(self, tunnel_env):
+        write_resolved_tunnel({"name": "vibecode-1", "resolved_at": time.time()})
+        cli.get_or_create_uuid(reset=True)
+        assert cli.load_resolved_tunnel() is None
+        assert "resolved_tunnel" not in json.loads(Path(".vibecode.json").read_text())
+
+
+class TestTunnelListCache:
+    """The tunnel list cached on disk for `vibecode start`."""
+    
+    def test_cached_list_reused_while_fingerprint_matches(self, tunnel_env):
+        fingerprint = cli._tunnel_list_fingerprint()
+        cli._save_cached_tunnel_list(fingerprint, {"vibecode-1": "abc"})
+        assert cli._load_cached_tunnel_list(cli._tunnel_list_fingerprint()) == {"vibecode-1": "abc"}
+    
+    def test_new_credentials_file_invalidates_cache(self, tunnel_env):
+        fingerprint = cli._tunnel_list_fingerprint()
+        cli._save_cached_tunnel_list(fingerprint, {"vibecode-1": "abc"})
+        
+        # `cloudflared tunnel create` drops a credentials file next to cert.pem
+        (tunnel_env / "def.json").write_text("{}")
+        mtime_ns = tunnel_env.stat().st_mtime_ns + 1_000_000_000
+        os.utime(tunnel_env, ns=(mtime_ns, mtime_ns))
+        
+        new_fingerprint = cli._tunnel_list_fingerprint()
+        assert new_fingerprint != fingerprint
+        assert cli._load_cached_tunnel_list(new_fingerprint) is None
+    
+    def test_login_invalidates_cache(self, tunnel_env):
+        fingerprint = cli._tunnel_list_fingerprint()
+        cli._save_cached_tunnel_list(fingerprint, {"vibecode-1": "abc"})
+        
+        cert_path = tunnel_env / "cert.pem"
+        mtime_ns = cert_path.stat().st_mtime_ns + 1_000_000_000
+        os.utime(cert_path, ns=(mtime_ns, mtime_ns))
+        
+        assert cli._load_cached_tunnel_list(cli._tunnel_list_fingerprint()) is None
+    
+    def test_cache_expires_after_ttl(self, tunnel_env):
+        fingerprint = cli._tunnel_list_fingerprint()
+        cli._save_cached_tunnel_list(fingerprint, {"vibecode-1": "abc"})
+        
+        cached = json.loads(cli._TUNNEL_LIST_CACHE_PATH.read_text())
+        cached["saved_at"] -= cli._TUNNEL_LIST_CACHE_TTL + 1
+        cli._TUNNEL_LIST_CACHE_PATH.write_text(json.dumps(cached))
+        assert cli._load_cached_tunnel_list(fingerprint) is None
+    
+    def test_no_fingerprint_without_login(self, tunnel_env):
+        (tunnel_env / "cert.pem").unlink()
+        assert cli._tunnel_list_fingerprint() is None
+    
+    def test_forget_resolved_tunnel_drops_cached_list(self, tunnel_env):
+        write_resolved_tunnel({"name": "vibecode-1", "resolved_at": time.time()})
+        cli._save_cached_tunnel_list(cli._tunnel_list_fingerprint(), {"vibecode-1": "abc"})
+        
+        cli.forget_resolved_tunnel()
+        
+        assert cli.load_resolved_tunnel() is None
+        assert not cli._TUNNEL_LIST_CACHE_PATH.exists()
@@ -211,7 +211,7 @@ def run_vibecode_server(port: int, use_tunnel: bool = False, tunnel_type: str =
                 proc.wait(timeout=5)
             except subprocess.TimeoutExpired:
                 proc.kill()
-                proc.wait()
+                proc.wait(timeout=2)
 
 
 class TestQuickTunnelInvestigation:
@@ -306,7 +306,11 @@ class TestQuickTunnelInvestigation:
             finally:
                 if proc.poll() is None:
                     proc.terminate()
-                    proc.wait(timeout=5)
+                    try:
+                        proc.wait(timeout=5)
+                    except subprocess.TimeoutExpired:
+                        proc.kill()
+                        proc.wait(timeout=2)
             
             # Re-raise the original exception with additional context
             raise Exception(f"Quick tunnel investigation failed: {e}. See analysis above for details.")
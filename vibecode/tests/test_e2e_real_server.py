@@ -16,6 +16,8 @@ sys.path.insert(0, str(Path(__file__).parent.parent))
 
 from vibecode.server import AuthenticatedMCPServer
 
+from tests.helpers import MCP_HEADERS
+
 
 class TestEndToEndRealServer:
     """Test actual server startup and MCP protocol endpoints."""
@@ -91,10 +93,7 @@ class TestEndToEndRealServer:
                     print(f"🔍 Trying MCP endpoint: {endpoint}")
                     response = requests.post(
                         endpoint,
-                        headers={
-                            "Content-Type": "application/json",
-                            "Accept": "application/json, text/event-stream"
-                        },
+                        headers=MCP_HEADERS,
                         json=tools_request,
                         timeout=10
                     )
@@ -216,10 +215,7 @@ class TestEndToEndRealServer:
         
         init_response = requests.post(
             f"http://127.0.0.1:{port}/mcp/",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json=init_request,
             timeout=10
         )
@@ -275,10 +271,7 @@ class TestEndToEndRealServer:
                 # Try the root path first
                 tools_response = requests.post(
                     f"http://127.0.0.1:{port}/",
-                    headers={
-                        "Content-Type": "application/json",
-                        "Accept": "application/json, text/event-stream"
-                    },
+                    headers=MCP_HEADERS,
                     json=tools_request,
                     timeout=10
                 )
@@ -406,10 +399,7 @@ class TestEndToEndRealServer:
         # Step 1: Initialize
         init_response = requests.post(
             f"http://127.0.0.1:{port}/mcp-exec/",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": 1,
@@ -428,10 +418,7 @@ class TestEndToEndRealServer:
         # Step 2: Test tool execution (the critical part that was failing)
         tool_call_response = requests.post(
             f"http://127.0.0.1:{port}/mcp-exec/",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": 2,
@@ -514,10 +501,7 @@ class TestEndToEndRealServer:
         # Initialize session
         init_response = requests.post(
             f"http://127.0.0.1:{port}/user-test/",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "user-init",
@@ -535,10 +519,7 @@ class TestEndToEndRealServer:
         # Execute the exact user command
         user_command_response = requests.post(
             f"http://127.0.0.1:{port}/user-test/",
-            headers={
-                "Content-Type": "application/json",
-                "Accept": "application/json, text/event-stream"
-            },
+            headers=MCP_HEADERS,
             json={
                 "jsonrpc": "2.0",
                 "id": "user-command",
@@ -55,6 +55,7 @@ def test_vibecode_local_mode():
             proc.wait(timeout=5)
         except subprocess.TimeoutExpired:
             proc.kill()
+            proc.wait(timeout=2)
 
 
 def test_package_structure():
@@ -10,6 +10,10 @@ import json
 import pytest
 from pathlib import Path
 
+TUNNEL_URL_RE = re.compile(r'https://[a-zA-Z0-9\-]+\.trycloudflare\.com')
+UUID_PATH_RE = re.compile(r'/([a-f0-9]{32})')
+COMPLETE_URL_RE = re.compile(r'https://[a-zA-Z0-9\-]+\.trycloudflare\.com/[a-f0-9]{32}')
+
 
 def test_real_vibecode_cli_with_tunnel():
     """The ONLY test that actually tests the real production flow."""
@@ -36,14 +40,14 @@ def test_real_vibecode_cli_with_tunnel():
                 
                 # Look for tunnel URL
                 if 'trycloudflare.com' in line:
-                    url_match = re.search(r'https://[a-zA-Z0-9\-]+\.trycloudflare\.com', line)
+                    url_match = TUNNEL_URL_RE.search(line)
                     if url_match:
                         base_tunnel_url = url_match.group(0)
                         print(f"🔗 Found tunnel URL: {base_tunnel_url}")
                 
                 # Look for UUID path  
-                if 'MCP at' in line or 'endpoint ready at' in line:
-                    uuid_match = re.search(r'/([a-f0-9]{32})', line)
+                if 'endpoint ready at' in line or 'MCP at' in line:
+                    uuid_match = UUID_PATH_RE.search(line)
                     if uuid_match:
                         uuid_path = uuid_match.group(1)
                         if base_tunnel_url:
@@ -54,11 +58,12 @@ def test_real_vibecode_cli_with_tunnel():
                             print(f"🔗 Found UUID path: /{uuid_path}, waiting for tunnel URL...")
                 
                 # Also check for the complete URL format that might be printed together
-                complete_url_match = re.search(r'https://[a-zA-Z0-9\-]+\.trycloudflare\.com/[a-f0-9]{32}', line)
-                if complete_url_match:
-                    tunnel_url = complete_url_match.group(0)
-                    print(f"🔗 Found complete tunnel URL: {tunnel_url}")
-                    break
+                if 'trycloudflare.com' in line:
+                    complete_url_match = COMPLETE_URL_RE.search(line)
+                    if complete_url_match:
+                        tunnel_url = complete_url_match.group(0)
+                        print(f"🔗 Found complete tunnel URL: {tunnel_url}")
+                        break
                         
         except Exception as e:
             print(f"❌ Error reading output: {e}")
@@ -203,10 +208,10 @@ def test_real_vibecode_cli_with_tunnel():
         print("🧹 Cleaning up...")
         try:
             proc.terminate()
-            proc.wait(timeout=10)
+            proc.wait(timeout=5)
         except subprocess.TimeoutExpired:
             proc.kill()
-            proc.wait()
+            proc.wait(timeout=2)
         print("✅ Cleanup complete")
 
 
@@ -2,22 +2,18 @@
 VibeCode - MCP server for Claude-Code with OAuth authentication and automatic Cloudflare tunneling.
 """
 
-# Suppress warnings at package level  
-import warnings
-import os
-
-# Suppress all deprecation warnings
-warnings.filterwarnings("ignore", category=DeprecationWarning)
-warnings.filterwarnings("ignore", message=".*class-based.*config.*deprecated.*")
-warnings.filterwarnings("ignore", message=".*websockets.legacy.*deprecated.*")
-warnings.filterwarnings("ignore", message=".*get_event_loop.*deprecated.*")
-
-# Suppress Pydantic warnings
-os.environ["PYDANTIC_DISABLE_WARNINGS"] = "1"
-
 __version__ = "0.1.0"
 
-from .server import AuthenticatedMCPServer
-from .oauth import OAuthProvider
+__all__ = ["AuthenticatedMCPServer", "OAuthProvider"]
+
 
-__all__ = ["AuthenticatedMCPServer", "OAuthProvider"]
\ No newline at end of file
+def __getattr__(name):
+    # Resolve the public classes on first access (PEP 562) so that importing
+    # the package, e.g. for the CLI, does not pull in FastAPI/MCP/pydantic.
+    if name == "AuthenticatedMCPServer":
+        from .server import AuthenticatedMCPServer
+        return AuthenticatedMCPServer
+    if name == "OAuthProvider":
+        from .oauth import OAuthProvider
+        return OAuthProvider
+    raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
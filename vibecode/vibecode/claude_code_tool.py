@@ -3,6 +3,7 @@
 import asyncio
 import os
 import shutil
+import signal
 import subprocess
 from pathlib import Path
 from typing import Optional, Dict, Any
@@ -42,12 +43,12 @@ class ClaudeCodeTool:
         cli_name = custom_cli_name or 'claude'
         
         # Try local install path: ~/.claude/local/claude
-        user_path = Path.home() / '.claude' / 'local' / 'claude'
+        user_path = os.path.join(os.path.expanduser("~"), ".claude", "local", "claude")
         logger.debug(f"Checking for Claude CLI at local user path: {user_path}")
-        
-        if user_path.exists():
+
+        if os.path.isfile(user_path):
             logger.debug(f"Found Claude CLI at local user path: {user_path}")
-            return str(user_path)
+            return user_path
         else:
             logger.debug(f"Claude CLI not found at local user path: {user_path}")
         
@@ -67,7 +68,8 @@ class ClaudeCodeTool:
         cwd: Optional[str] = None
     ) -> Dict[str, str]:
         """Asynchronously spawn a process with timeout and error handling."""
-        logger.debug(f"Running command: {command} {' '.join(args)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Running command: %s %s", command, " ".join(args))
         
         try:
             process = await asyncio.create_subprocess_exec(
@@ -75,7 +77,8 @@ class ClaudeCodeTool:
                 *args,
                 stdout=asyncio.subprocess.PIPE,
                 stderr=asyncio.subprocess.PIPE,
-                cwd=cwd
+                cwd=cwd,
+                start_new_session=True  # Own process group so timeouts reap Claude's children too
             )
             
             # Wait for process with timeout
@@ -84,13 +87,14 @@ class ClaudeCodeTool:
                 timeout=timeout or self.timeout
             )
             
-            stdout = stdout_data.decode('utf-8')
-            stderr = stderr_data.decode('utf-8')
+            stdout = stdout_data.decode('utf-8', errors='replace')
+            stderr = stderr_data.decode('utf-8', errors='replace')
             
-            logger.debug(f"Exit code: {process.returncode}")
-            logger.debug(f"Stdout: {stdout.strip()}")
-            if stderr:
-                logger.debug(f"Stderr: {stderr.strip()}")
+            if logger.isEnabledFor(logging.DEBUG):
+                logger.debug("Exit code: %s", process.returncode)
+                logger.debug("Stdout: %s", stdout.strip())
+                if stderr:
+                    logger.debug("Stderr: %s", stderr.strip())
             
             if process.returncode != 0:
                 error_msg = f"Command failed with exit code {process.returncode}"
@@ -104,6 +108,7 @@ class ClaudeCodeTool:
             
         except asyncio.TimeoutError:
             logger.error(f"Command timed out after {timeout or self.timeout} seconds")
+            await self._kill_process_group(process)
             raise TimeoutError(f"Claude CLI command timed out after {timeout or self.timeout} seconds")
         except FileNotFoundError as e:
             logger.error(f"Claude CLI not found: {e}")
@@ -116,6 +121,24 @@ class ClaudeCodeTool:
             logger.error(f"Error executing Claude CLI: {e}")
             raise RuntimeError(f"Claude CLI execution failed: {e}")
     
+    async def _kill_process_group(self, process: asyncio.subprocess.Process) -> None:
+        """Terminate a timed-out process together with every child it spawned."""
+        try:
+            if not hasattr(os, "killpg"):
+                # No process groups on Windows; only the CLI process itself can be killed
+                process.kill()
+                return
+            # start_new_session=True makes the child a session leader, so its pid is the group id
+            os.killpg(process.pid, signal.SIGTERM)
+            try:
+                await asyncio.wait_for(process.wait(), timeout=2)
+            except asyncio.TimeoutError:
+                pass
+            os.killpg(process.pid, signal.SIGKILL)
+        except (ProcessLookupError, PermissionError):
+            # The whole group has already exited (on macOS a group of zombies reports EPERM)
+            pass
+    
     async def execute_claude_code(
         self, 
         prompt: str, 
@@ -150,7 +173,8 @@ class ClaudeCodeTool:
         
         # Prepare Claude CLI arguments
         claude_args = ['--dangerously-skip-permissions', '-p', prompt]
-        logger.debug(f"Invoking Claude CLI: {self.claude_cli_path} {' '.join(claude_args)}")
+        if logger.isEnabledFor(logging.DEBUG):
+            logger.debug("Invoking Claude CLI: %s %s", self.claude_cli_path, " ".join(claude_args))
         
         try:
             result = await self._spawn_async(
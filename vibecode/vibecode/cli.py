@@ -1,127 +1,276 @@
-# Suppress all warnings before any imports
-import warnings
-import os
-warnings.simplefilter("ignore")
-os.environ["PYDANTIC_DISABLE_WARNINGS"] = "1"
-
-# Apply compatibility patches before other imports
-try:
-    from .compatibility_patch import patch_mcp_imports
-    patch_mcp_imports()
-except ImportError:
-    # If compatibility patch is not available, try a direct fix
-    try:
-        import mcp
-        import mcp.types
-        if not hasattr(mcp, 'McpError'):
-            mcp.McpError = mcp.types.JSONRPCError
-    except ImportError:
-        pass
+# Silence warnings raised by the server dependencies, before any of them are imported
+from .warning_filters import silence_dependency_warnings
+silence_dependency_warnings()
 
+import _thread
 import argparse
+import collections
+import functools
 import json
+import logging
+import os
+import queue
 import re
+import secrets
+import selectors
+import shutil
+import signal
+import socket
 import subprocess
 import sys
 import threading
 import time
-import uuid
+from dataclasses import dataclass, field
 from pathlib import Path
-from typing import Tuple, Optional
+from typing import Dict, Tuple, Optional
+
+# Status messages go to stderr through this logger so that arguments are only
+# formatted when the message is actually emitted
+_log = logging.getLogger("vibecode.cli")
+
 
-from mcp_claude_code.server import ClaudeCodeServer
+# Quick tunnel URL as printed by cloudflared (inside its pipe-bordered banner).
+# cloudflared output is scanned as raw bytes, so these patterns are bytes too.
+_TRYCLOUDFLARE_URL_RE = re.compile(rb'https://[a-zA-Z0-9-]+\.trycloudflare\.com')
 
-from .server import AuthenticatedMCPServer
+# Rate-limit and error lines in cloudflared output, matched in one pass. The
+# anchored lookahead lets a rate limit anywhere on the line win over an error.
+_CLOUDFLARED_SIGNAL_RE = re.compile(
+    rb'^(?=.*?(?P<rate_limit>Too Many Requests))'
+    rb'|(?P<error>ERR.*(?:error code|failed to))'
+)
 
+# Public hostname in `cloudflared tunnel info` output, e.g.
+# "https://example.your-domain.com", "https://tunnel-name.cfargotunnel.com".
+# Any hostname is accepted, so no per-suffix alternation is needed (and a
+# trailing "/path" is left out of the captured host)
+_TUNNEL_DOMAIN_RE = re.compile(r'https://([a-zA-Z0-9.-]{2,})')
 
+# Parsed .vibecode.json contents keyed by path, as (st_mtime_ns, config)
+_CONFIG_CACHE: dict = {}
+
+# How long (seconds) a saved tunnel is reused without asking cloudflared: briefly when
+# its id is unknown, longer while its credentials file is on disk. Either way the
+# tunnel may have been deleted on Cloudflare's side in the meantime.
+_RESOLVED_TUNNEL_TTL = 3600
+_RESOLVED_TUNNEL_MAX_AGE = 24 * 3600
+
+# Common locations for cloudflared outside PATH
+_CLOUDFLARED_PATHS = (
+    "/opt/homebrew/bin/cloudflared",  # Homebrew on Apple Silicon
+    "/usr/local/bin/cloudflared",  # Homebrew on Intel Mac
+    "/usr/bin/cloudflared",  # Linux system install
+)
+
+# cloudflared login state, and where the parsed `cloudflared tunnel list` is kept between runs
+_CLOUDFLARED_DIR = Path.home() / ".cloudflared"
+# Directories cloudflared searches for cert.pem, in its own order of preference
+_CLOUDFLARED_CONFIG_DIRS = (
+    _CLOUDFLARED_DIR,
+    Path.home() / ".cloudflare-warp",
+    Path.home() / "cloudflare-warp",
+    Path("/etc/cloudflared"),
+    Path("/usr/local/etc/cloudflared"),
+)
+_TUNNEL_LIST_CACHE_PATH = Path.home() / ".cache" / "vibecode" / "tunnels.json"
+# How long (seconds) `vibecode start` trusts that cache; tunnels can also change on other machines
+_TUNNEL_LIST_CACHE_TTL = 300
+
+
+@functools.lru_cache(maxsize=1)
 def get_vibecode_config_path() -> Path:
-    """Get the path to .vibecode.json in the current working directory."""
+    """Get the path to .vibecode.json in the current working directory (resolved once per run)."""
     return Path.cwd() / ".vibecode.json"
 
 
+def _read_vibecode_config(config_path: Path) -> dict:
+    """Parse .vibecode.json, reusing the cached result while its mtime is unchanged."""
+    mtime_ns = config_path.stat().st_mtime_ns
+    cached = _CONFIG_CACHE.get(config_path)
+    if cached is not None and cached[0] == mtime_ns:
+        return cached[1]
+    
+    with open(config_path, 'r') as f:
+        config = json.load(f)
+    _CONFIG_CACHE[config_path] = (mtime_ns, config)
+    return config
+
+
 def load_persistent_uuid() -> Optional[str]:
     """Load persistent UUID from .vibecode.json file."""
     config_path = get_vibecode_config_path()
     try:
-        if config_path.exists():
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-                return config.get('uuid')
+        return _read_vibecode_config(config_path).get('uuid')
+    except FileNotFoundError:
+        pass
     except (json.JSONDecodeError, IOError) as e:
-        print(f"Warning: Could not read .vibecode.json: {e}", file=sys.stderr)
+        _log.warning("Warning: Could not read .vibecode.json: %s", e)
     return None
 
 
-def save_persistent_uuid(uuid_value: str) -> None:
-    """Save persistent UUID to .vibecode.json file."""
+def _update_vibecode_config(updates: dict, remove: Tuple[str, ...] = ()) -> Path:
+    """Merge updates into .vibecode.json, drop the remove keys, and write it back; raises IOError on failure."""
     config_path = get_vibecode_config_path()
     
-    # Load existing config or create new one
-    config = {}
-    if config_path.exists():
-        try:
-            with open(config_path, 'r') as f:
-                config = json.load(f)
-        except (json.JSONDecodeError, IOError):
-            # If file is corrupted, start fresh
-            config = {}
+    # Load existing config or create new one (a missing or corrupted file starts fresh)
+    try:
+        config = dict(_read_vibecode_config(config_path))
+    except (json.JSONDecodeError, IOError):
+        config = {}
     
-    # Update UUID
-    config['uuid'] = uuid_value
+    config.update(updates)
+    for key in remove:
+        config.pop(key, None)
     
-    # Save config
+    # Save config via a temp file and atomic rename so an interrupted write
+    # can never leave a truncated .vibecode.json behind
+    tmp_path = config_path.with_name(config_path.name + '.tmp')
+    with open(tmp_path, 'w') as f:
+        f.write(json.dumps(config, separators=(',', ':')))
+    os.replace(tmp_path, config_path)
+    _CONFIG_CACHE[config_path] = (config_path.stat().st_mtime_ns, config)
+    return config_path
+
+
+def save_persistent_uuid(uuid_value: str) -> None:
+    """Save persistent UUID to .vibecode.json file."""
+    try:
+        config_path = _update_vibecode_config({'uuid': uuid_value})
+        _log.info("💾 Saved session UUID to %s", config_path)
+    except IOError as e:
+        _log.warning("Warning: Could not save .vibecode.json: %s", e)
+
+
+def load_resolved_tunnel() -> Optional[str]:
+    """Load the tunnel name saved by an earlier start, if it can still be used."""
+    try:
+        entry = _read_vibecode_config(get_vibecode_config_path()).get('resolved_tunnel')
+        age = time.time() - entry['resolved_at']
+        tunnel_id = entry.get('id')
+        if tunnel_id:
+            # `cloudflared tunnel run` cannot start the tunnel without its credentials
+            # file, which cloudflared keeps next to the origin certificate
+            cert_path = _find_origin_cert()
+            credentials_dir = cert_path.parent if cert_path else _CLOUDFLARED_DIR
+            if not (credentials_dir / f"{tunnel_id}.json").is_file():
+                return None
+            if age < _RESOLVED_TUNNEL_MAX_AGE:
+                return entry['name']
+        elif age < _RESOLVED_TUNNEL_TTL:
+            return entry['name']
+    except (json.JSONDecodeError, IOError, KeyError, TypeError, AttributeError):
+        # Missing file, no saved tunnel yet, or a hand-edited entry
+        pass
+    return None
+
+
+def save_resolved_tunnel(tunnel_name: str, tunnel_id: Optional[str] = None) -> None:
+    """Remember which tunnel this project uses so the next start can skip the lookup."""
+    entry = {'name': tunnel_name, 'resolved_at': int(time.time())}
+    if tunnel_id:
+        entry['id'] = tunnel_id
+    try:
+        _update_vibecode_config({'resolved_tunnel': entry})
+    except IOError as e:
+        _log.warning("Warning: Could not save .vibecode.json: %s", e)
+
+
+def forget_resolved_tunnel() -> None:
+    """Drop the saved tunnel so the next start looks it up (or creates one) again."""
     try:
-        with open(config_path, 'w') as f:
-            json.dump(config, f, indent=2)
-        print(f"💾 Saved session UUID to {config_path}", file=sys.stderr)
+        _update_vibecode_config({}, remove=('resolved_tunnel',))
     except IOError as e:
-        print(f"Warning: Could not save .vibecode.json: {e}", file=sys.stderr)
+        _log.warning("Warning: Could not save .vibecode.json: %s", e)
+    
+    # The cached tunnel lists would hand the same tunnel straight back, so make
+    # the next lookup ask cloudflared
+    _tunnel_inventory.cache_clear()
+    try:
+        _TUNNEL_LIST_CACHE_PATH.unlink()
+    except OSError:
+        pass
 
 
 def get_or_create_uuid(reset: bool = False) -> str:
     """Get existing UUID from .vibecode.json or create a new one."""
     # If reset flag is set, force creation of new UUID
     if reset:
-        print(f"🔄 Resetting session UUID (--reset-uuid)", file=sys.stderr)
-        new_uuid = uuid.uuid4().hex
+        _log.info("🔄 Resetting session UUID (--reset-uuid)")
+        new_uuid = secrets.token_hex(16)
         save_persistent_uuid(new_uuid)
+        # A reset starts the project over, including its tunnel choice
+        forget_resolved_tunnel()
         return new_uuid
     
     # Try to load existing UUID
     existing_uuid = load_persistent_uuid()
     if existing_uuid:
-        print(f"🔄 Using saved session UUID from .vibecode.json", file=sys.stderr)
+        _log.info("🔄 Using saved session UUID from .vibecode.json")
         return existing_uuid
     
     # Create new UUID
-    new_uuid = uuid.uuid4().hex
-    print(f"🆕 Generated new session UUID", file=sys.stderr)
+    new_uuid = secrets.token_hex(16)
+    _log.info("🆕 Generated new session UUID")
     save_persistent_uuid(new_uuid)
     return new_uuid
 
 
-def check_cloudflared() -> bool:
-    """Check if cloudflared is installed and available in PATH."""
-    # Common locations for cloudflared
-    cloudflared_paths = [
-        "cloudflared",  # In PATH
-        "/opt/homebrew/bin/cloudflared",  # Homebrew on Apple Silicon
-        "/usr/local/bin/cloudflared",  # Homebrew on Intel Mac
-        "/usr/bin/cloudflared",  # Linux system install
-    ]
-    
-    for path in cloudflared_paths:
+@functools.lru_cache(maxsize=1)
+def _find_cloudflared() -> Optional[str]:
+    """Locate the cloudflared binary once per process without spawning it."""
+    path = shutil.which("cloudflared")
+    if path:
+        return path
+    for path in _CLOUDFLARED_PATHS:
+        if os.path.isfile(path) and os.access(path, os.X_OK):
+            return path
+    return None
+
+
+def _apply_compatibility_patches() -> None:
+    """Patch MCP library issues; must run before mcp_claude_code is imported."""
+    try:
+        from .compatibility_patch import patch_mcp_imports
+        patch_mcp_imports()
+    except ImportError:
+        # If compatibility patch is not available, try a direct fix
         try:
-            subprocess.run([path, "--version"], capture_output=True, check=True)
-            return True
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
-    return False
+            import mcp
+            import mcp.types
+            if not hasattr(mcp, 'McpError'):
+                mcp.McpError = mcp.types.JSONRPCError
+        except ImportError:
+            pass
 
 
-def run_mcp_server(port: int, path: str, enable_auth: bool = True) -> None:
-    """Run the Claude-Code MCP server (blocking)."""
-    import logging
+def _preload_server_stack() -> None:
+    """
+    Import the server stack ahead of run_mcp_server.
+    
+    Runs on a helper thread while cloudflared negotiates the tunnel, so the
+    slow MCP/FastAPI/pydantic imports overlap with the edge handshake. Any
+    failure is left for run_mcp_server to hit and report.
+    """
+    try:
+        _apply_compatibility_patches()
+        import mcp_claude_code.server
+        from . import server
+    except Exception:
+        pass
+
+
+def run_mcp_server(port: int, path: str, enable_auth: bool = True,
+                   ready_event: Optional[threading.Event] = None) -> None:
+    """
+    Run the Claude-Code MCP server (blocking).
+    
+    If ready_event is given it is set once the server object is built and
+    about to bind, or when startup fails, so callers never wait blindly.
+    """
+    # Server stack (MCP, FastAPI, uvicorn, pydantic) is only needed by `start`
+    _apply_compatibility_patches()
+    from mcp_claude_code.server import ClaudeCodeServer
+    from .server import AuthenticatedMCPServer
     
     # Configure logging for cleaner output
     logging.basicConfig(
@@ -144,6 +293,8 @@ def run_mcp_server(port: int, path: str, enable_auth: bool = True) -> None:
                 enable_agent_tool=False,
                 base_url=base_url
             )
+            if ready_event is not None:
+                ready_event.set()
             
             # Run with SSE transport and OAuth authentication
             # Bind to 0.0.0.0 to ensure cloudflared can connect from any interface
@@ -155,17 +306,144 @@ def run_mcp_server(port: int, path: str, enable_auth: bool = True) -> None:
                 allowed_paths=["/"],  # Allow full filesystem access for now
                 enable_agent_tool=False
             )
+            if ready_event is not None:
+                ready_event.set()
             
             # Run with SSE transport and custom parameters
             # Bind to 0.0.0.0 to ensure cloudflared can connect from any interface
             server.mcp.run(transport="sse", host="0.0.0.0", port=port, path=path)
         
     except Exception as e:
-        print(f"Error running MCP server: {e}", file=sys.stderr)
+        _log.error("Error running MCP server: %s", e)
+        if ready_event is not None:
+            ready_event.set()
         sys.exit(1)
 
 
-def start_tunnel(local_url: str, tunnel_name: Optional[str] = None, max_retries: int = 3) -> Tuple[str, subprocess.Popen]:
+def _wait_for_port(port: int, timeout: float = 10.0, interval: float = 0.025) -> bool:
+    """Poll until something accepts TCP connections on 127.0.0.1:port."""
+    deadline = time.monotonic() + timeout
+    delay = interval
+    while True:
+        try:
+            # Loopback either accepts or refuses at once; the timeout only guards a wedged listener
+            socket.create_connection(('127.0.0.1', port), timeout=0.5).close()
+            return True
+        except OSError:
+            pass
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return False
+        # Back off gently so a slow server start is not hammered with connects
+        time.sleep(min(delay, remaining))
+        delay = min(delay * 2, 0.5)
+
+
+def _iter_output_lines(process: subprocess.Popen, timeout: float):
+    """
+    Yield raw byte lines from a process's stdout until EOF or the timeout elapses.
+    
+    On POSIX it waits on the pipe with a selector rather than polling
+    readline(), so the thread sleeps until output arrives and the timeout holds even if the
+    process stops writing mid-line. Lines are left undecoded; callers decode
+    only the ones they actually display.
+    """
+    if sys.platform == "win32":
+        yield from _iter_output_lines_threaded(process, timeout)
+        return
+    
+    fd = process.stdout.fileno()
+    deadline = time.monotonic() + timeout
+    pending = bytearray()
+    
+    with selectors.DefaultSelector() as selector:
+        selector.register(fd, selectors.EVENT_READ)
+        while True:
+            remaining = deadline - time.monotonic()
+            if remaining <= 0 or not selector.select(remaining):
+                return
+            chunk = os.read(fd, 4096)
+            if not chunk:
+                # EOF - the process closed its output (usually because it exited)
+                if pending:
+                    yield bytes(pending)
+                return
+            pending += chunk
+            end = pending.rfind(b"\n")
+            if end < 0:
+                continue
+            # Split off every complete line and keep the partial tail buffered
+            lines = pending[:end].split(b"\n")
+            del pending[:end + 1]
+            for line in lines:
+                yield bytes(line)
+
+
+def _iter_output_lines_threaded(process: subprocess.Popen, timeout: float):
+    """
+    Windows version of _iter_output_lines.
+    
+    select() only accepts sockets on Windows, so a daemon thread blocks in
+    readline() instead and hands each line over through a queue.
+    """
+    lines = queue.Queue()
+    
+    def pump() -> None:
+        for line in iter(process.stdout.readline, b""):
+            lines.put(line.rstrip(b"\n"))
+        lines.put(None)  # EOF
+    
+    threading.Thread(target=pump, daemon=True).start()
+    deadline = time.monotonic() + timeout
+    while True:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            return
+        try:
+            line = lines.get(timeout=remaining)
+        except queue.Empty:
+            return
+        if line is None:
+            return
+        yield line
+
+
+def _decode_output(line: bytes) -> str:
+    """Turn one raw line of process output into display text."""
+    return line.strip().decode("utf-8", errors="replace")
+
+
+def _announce_when_ready(port: int, ready_event: threading.Event, announce=None) -> None:
+    """Wait for the server to accept connections, report it, then call announce()."""
+    ready_event.wait(timeout=15)
+    if _wait_for_port(port):
+        _log.info("Server is ready on port %d", port)
+    else:
+        _log.warning("Warning: Could not verify server is ready, proceeding anyway...")
+    if announce is not None:
+        announce()
+
+
+def _supervise_tunnel(tunnel_process: subprocess.Popen, stopping: threading.Event,
+                      died: threading.Event) -> None:
+    """Stop the server running on the main thread if the tunnel process dies, and set died."""
+    returncode = tunnel_process.wait()
+    if stopping.is_set():
+        return
+    if returncode in (0, -signal.SIGINT, -signal.SIGTERM):
+        # A clean shutdown on a signal: cloudflared shares the terminal's process
+        # group, so this is normally the same Ctrl+C the server is already handling
+        return
+    died.set()
+    _log.error("\ncloudflared exited unexpectedly (code %s)", returncode)
+    # Delivered like Ctrl+C, so uvicorn runs its normal graceful shutdown
+    _thread.interrupt_main()
+
+
+def start_tunnel(local_url: str, tunnel_name: Optional[str] = None, max_retries: int = 3,
+                 keepalive_connections: int = 100,
+                 protocol: str = "auto",
+                 verbose: bool = False) -> Tuple[str, subprocess.Popen]:
     """
     Runs cloudflared tunnel and returns the publicly accessible URL.
     
@@ -173,46 +451,38 @@ def start_tunnel(local_url: str, tunnel_name: Optional[str] = None, max_retries:
         local_url: The local URL to tunnel (e.g., http://localhost:8300/path)
         tunnel_name: Optional named tunnel to use (requires Cloudflare account setup)
         max_retries: Maximum number of retry attempts (default: 3)
+        keepalive_connections: Idle connections cloudflared keeps open to the local server
+        protocol: Edge transport ("auto", "http2" or "quic")
+        verbose: Echo all cloudflared output instead of only showing it on failure
     
     Returns:
         Tuple of (public_url, process)
     """
     # Pass the full local_url including UUID path to cloudflared
     # This ensures cloudflared forwards requests to the correct endpoint
-    # Find cloudflared binary
-    cloudflared_paths = [
-        "cloudflared",  # In PATH
-        "/opt/homebrew/bin/cloudflared",  # Homebrew on Apple Silicon
-        "/usr/local/bin/cloudflared",  # Homebrew on Intel Mac
-        "/usr/bin/cloudflared",  # Linux system install
-    ]
-    
-    cloudflared_cmd = None
-    for path in cloudflared_paths:
-        try:
-            subprocess.run([path, "--version"], capture_output=True, check=True)
-            cloudflared_cmd = path
-            break
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
-    
+    cloudflared_cmd = _find_cloudflared()
     if not cloudflared_cmd:
         raise RuntimeError("cloudflared not found in any expected location")
     
+    # Reuse connections to the local server instead of opening one per request
+    tunnel_args = [cloudflared_cmd, "tunnel", "--no-autoupdate",
+                   "--proxy-keepalive-connections", str(keepalive_connections)]
+    if protocol != "auto":
+        tunnel_args += ["--protocol", protocol]
+    
     if tunnel_name:
         # Use named tunnel (persistent domain)
-        print(f"Starting cloudflared with URL: {local_url}", file=sys.stderr)
+        _log.info("Starting cloudflared with URL: %s", local_url)
         process = subprocess.Popen(
-            [cloudflared_cmd, "tunnel", "--no-autoupdate", "--url", local_url, "run", tunnel_name],
+            [*tunnel_args, "--url", local_url, "run", tunnel_name],
             stdout=subprocess.PIPE,
             stderr=subprocess.STDOUT,
-            text=True,
-            bufsize=1,  # Line buffered
+            close_fds=False,  # Lets subprocess use posix_spawn instead of fork+exec
         )
         
         # For named tunnels, the domain follows a predictable pattern
         public_url = f"https://{tunnel_name}.cfargotunnel.com"
-        print(f"Using tunnel domain: {public_url}", file=sys.stderr)
+        _log.info("Using tunnel domain: %s", public_url)
         
         return public_url, process
     else:
@@ -221,82 +491,79 @@ def start_tunnel(local_url: str, tunnel_name: Optional[str] = None, max_retries:
         
         for attempt in range(max_retries):
             if attempt > 0:
-                print(f"🔄 Retrying tunnel creation (attempt {attempt + 1}/{max_retries})...", file=sys.stderr)
+                _log.info("🔄 Retrying tunnel creation (attempt %d/%d)...", attempt + 1, max_retries)
                 time.sleep(2 * attempt)  # Exponential backoff: 2s, 4s, 6s...
             
-            print(f"Starting cloudflared with URL: {local_url}", file=sys.stderr)
+            _log.info("Starting cloudflared with URL: %s", local_url)
             process = subprocess.Popen(
-                [cloudflared_cmd, "tunnel", "--no-autoupdate", "--url", local_url],
+                [*tunnel_args, "--url", local_url],
                 stdout=subprocess.PIPE,
                 stderr=subprocess.STDOUT,
-                text=True,
-                bufsize=1,  # Line buffered
+                close_fds=False,  # Lets subprocess use posix_spawn instead of fork+exec
             )
             
             public_url = None
             rate_limited = False
             error_detected = False
             
-            # Parse stdout to find the assigned URL
-            # Updated pattern to handle cloudflared's output format with pipes and spaces
-            url_pattern = re.compile(r'https://[a-zA-Z0-9-]+\.trycloudflare\.com')
-            
             # Give cloudflared more time to start and output the URL
-            start_time = time.time()
             timeout = 60  # Increased to 60 seconds timeout for better reliability
             
-            while time.time() - start_time < timeout:
-                line = process.stdout.readline()
-                if not line:
-                    if process.poll() is not None:
-                        # Process terminated
-                        break
-                    # Continue reading - cloudflared might be slow to output
-                    time.sleep(0.1)
-                    continue
-                    
-                # Print cloudflared output for debugging
-                print(f"[cloudflared] {line.strip()}", file=sys.stderr)
-                
-                # Check for rate limiting
-                if "429 Too Many Requests" in line or "Too Many Requests" in line:
-                    rate_limited = True
-                    print("⚠️  Cloudflare rate limiting detected", file=sys.stderr)
-                    break
+            # cloudflared's startup chatter is only worth showing when this attempt
+            # fails, so keep just the most recent lines (or echo live with --verbose)
+            recent_output = collections.deque(maxlen=32)
+            
+            for line in _iter_output_lines(process, timeout):
+                if verbose:
+                    sys.stderr.write(f"[cloudflared] {_decode_output(line)}\n")
+                else:
+                    recent_output.append(line)
                 
-                # Check for other errors
-                if "ERR" in line and ("error code" in line or "failed to" in line):
+                # Check for rate limiting ("429 Too Many Requests" contains this too)
+                # and other errors
+                signal_match = _CLOUDFLARED_SIGNAL_RE.search(line)
+                if signal_match:
+                    if signal_match.lastgroup == "rate_limit":
+                        rate_limited = True
+                        _log.warning("⚠️  Cloudflare rate limiting detected")
+                        break
                     error_detected = True
-                    last_error = line.strip()
+                    last_error = _decode_output(line)
                 
-                if not public_url:
+                # Only lines mentioning the quick tunnel domain can hold the URL,
+                # so skip the regex for everything else
+                if not public_url and b"trycloudflare.com" in line:
                     # Check for URL in the line (handles cloudflared's pipe-bordered format)
-                    match = url_pattern.search(line)
+                    match = _TRYCLOUDFLARE_URL_RE.search(line)
                     if match:
-                        public_url = match.group(0)
-                        print(f"✅ Found tunnel URL: {public_url}", file=sys.stderr)
+                        public_url = match.group(0).decode("ascii")
+                        _log.info("✅ Found tunnel URL: %s", public_url)
                         return public_url, process
             
-            # If we get here, this attempt failed
+            # If we get here, this attempt failed; show what cloudflared said
             process.terminate()
+            if recent_output:
+                sys.stderr.write("".join(f"[cloudflared] {_decode_output(line)}\n" for line in recent_output))
             
             if rate_limited:
                 if attempt < max_retries - 1:
-                    print(f"🕐 Rate limited, waiting before retry...", file=sys.stderr)
+                    _log.info("🕐 Rate limited, waiting before retry...")
                     continue
                 else:
-                    print("❌ Maximum retries reached due to rate limiting", file=sys.stderr)
-                    print("💡 Consider using a persistent tunnel: vibecode setup", file=sys.stderr)
+                    _log.error(
+                        "❌ Maximum retries reached due to rate limiting\n"
+                        "💡 Consider using a persistent tunnel: vibecode setup"
+                    )
                     raise RuntimeError("Cloudflare quick tunnel rate limited - use 'vibecode setup' for persistent domain")
             elif error_detected:
                 if attempt < max_retries - 1:
-                    print(f"🔄 Error detected, retrying: {last_error}", file=sys.stderr)
+                    _log.info("🔄 Error detected, retrying: %s", last_error)
                     continue
                 else:
                     raise RuntimeError(f"Failed to create tunnel after {max_retries} attempts. Last error: {last_error}")
             else:
                 if attempt < max_retries - 1:
-                    print(f"⏰ Timeout waiting for tunnel URL, retrying...", file=sys.stderr)
+                    _log.info("⏰ Timeout waiting for tunnel URL, retrying...")
                     continue
                 else:
                     raise RuntimeError(f"Failed to obtain Cloudflare quick tunnel URL within timeout after {max_retries} attempts")
@@ -319,11 +586,7 @@ def get_tunnel_domain(cloudflared_cmd: str, tunnel_name: str) -> Optional[str]:
         for line in result.stdout.split('\n'):
             # Look for various domain patterns
             if 'https://' in line:
-                # Try to extract domain from patterns like:
-                # "https://example.your-domain.com"
-                # "https://tunnel-name.cfargotunnel.com" 
-                # "https://example.cloudflareaccess.com"
-                match = re.search(r'https://([a-zA-Z0-9.-]+(?:\.cfargotunnel\.com|\.cloudflareaccess\.com|\.trycloudflare\.com|[a-zA-Z0-9.-]+))', line)
+                match = _TUNNEL_DOMAIN_RE.search(line)
                 if match:
                     return f"https://{match.group(1)}"
         
@@ -336,91 +599,197 @@ def get_tunnel_domain(cloudflared_cmd: str, tunnel_name: str) -> Optional[str]:
         return f"https://{tunnel_name}.cfargotunnel.com"
 
 
-def list_tunnels() -> list:
-    """List available named tunnels."""
-    cloudflared_paths = [
-        "cloudflared",
-        "/opt/homebrew/bin/cloudflared",
-        "/usr/local/bin/cloudflared",
-        "/usr/bin/cloudflared",
-    ]
-    
-    cloudflared_cmd = None
-    for path in cloudflared_paths:
-        try:
-            subprocess.run([path, "--version"], capture_output=True, check=True)
-            cloudflared_cmd = path
-            break
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
+@dataclass(frozen=True)
+class TunnelInventory:
+    """Outcome of one `cloudflared tunnel list` call."""
+    authenticated: bool
+    tunnel_ids: Dict[str, str] = field(default_factory=dict)  # name -> tunnel id
+    
+    @property
+    def tunnels(self) -> Tuple[str, ...]:
+        return tuple(self.tunnel_ids)
+
+
+def _parse_tunnel_list(output: str) -> Dict[str, str]:
+    """Map tunnel names to ids from `cloudflared tunnel list --output json` output."""
+    try:
+        entries = json.loads(output)
+    except ValueError:
+        # Not JSON after all; fall back to reading the text table
+        return _parse_tunnel_table(output)
+    if not isinstance(entries, list):
+        # Valid JSON but not a tunnel list (e.g. null or an error object)
+        return _parse_tunnel_table(output)
+    return {entry["name"]: entry.get("id", "")
+            for entry in entries if isinstance(entry, dict) and entry.get("name")}
+
+
+def _parse_tunnel_table(output: str) -> Dict[str, str]:
+    """Map tunnel names to ids from the text table printed by `cloudflared tunnel list`."""
+    tunnels = {}
+    in_table = False
+    for line in output.splitlines():
+        # Only the first two columns matter, so leave the rest of the line unsplit
+        parts = line.split(None, 2)
+        if not in_table:
+            # Skip the hint text cloudflared prints above the "ID NAME ..." header
+            in_table = parts[:1] == ["ID"]
+        elif len(parts) >= 2:
+            tunnels[parts[1]] = parts[0]  # ID and NAME columns
+    return tunnels
+
+
+def _find_origin_cert() -> Optional[Path]:
+    """Locate the certificate written by `cloudflared tunnel login` the way cloudflared does."""
+    env_cert = os.environ.get("TUNNEL_ORIGIN_CERT")
+    if env_cert:
+        return Path(env_cert) if os.path.isfile(env_cert) else None
+    for config_dir in _CLOUDFLARED_CONFIG_DIRS:
+        cert_path = config_dir / "cert.pem"
+        if cert_path.is_file():
+            return cert_path
+    return None
+
+
+def _tunnel_list_fingerprint() -> Optional[list]:
+    """
+    Describe the local cloudflared login state by modification times.
     
+    cert.pem changes on login, and `tunnel create`/`delete` add or remove a
+    credentials file next to it, so a cached tunnel list is valid for as
+    long as this fingerprint stays the same. Returns None when not logged in.
+    """
+    cert_path = _find_origin_cert()
+    if cert_path is None:
+        return None
+    try:
+        cert_mtime = cert_path.stat().st_mtime_ns
+        dir_mtime = cert_path.parent.stat().st_mtime_ns
+    except OSError:
+        return None
+    try:
+        config_mtime = (cert_path.parent / "config.yml").stat().st_mtime_ns
+    except OSError:
+        config_mtime = None
+    return [str(cert_path), cert_mtime, dir_mtime, config_mtime]
+
+
+def _load_cached_tunnel_list(fingerprint: list) -> Optional[Dict[str, str]]:
+    """Return the tunnels saved by a recent run if the fingerprint still matches."""
+    try:
+        with open(_TUNNEL_LIST_CACHE_PATH, 'r') as f:
+            cached = json.load(f)
+        if (cached.get('fingerprint') == fingerprint
+                and time.time() - cached['saved_at'] < _TUNNEL_LIST_CACHE_TTL):
+            return dict(cached['tunnels'])
+    except (OSError, ValueError, KeyError, TypeError, AttributeError):
+        pass
+    return None
+
+
+def _save_cached_tunnel_list(fingerprint: list, tunnels: Dict[str, str]) -> None:
+    """Persist the parsed tunnel list; the cache is best effort, so failures are ignored."""
+    tmp_path = _TUNNEL_LIST_CACHE_PATH.with_name(_TUNNEL_LIST_CACHE_PATH.name + '.tmp')
+    try:
+        _TUNNEL_LIST_CACHE_PATH.parent.mkdir(parents=True, exist_ok=True)
+        with open(tmp_path, 'w') as f:
+            json.dump({'fingerprint': fingerprint, 'saved_at': int(time.time()), 'tunnels': tunnels}, f)
+        os.replace(tmp_path, _TUNNEL_LIST_CACHE_PATH)
+    except OSError:
+        pass
+
+
+def _query_tunnel_inventory() -> TunnelInventory:
+    """
+    Run `cloudflared tunnel list` and refresh the on-disk cache with the result.
+    
+    A non-zero exit status means the user is not logged in to Cloudflare, so
+    the same call answers both "authenticated?" and "which tunnels exist?".
+    """
+    cloudflared_cmd = _find_cloudflared()
     if not cloudflared_cmd:
-        return []
+        return TunnelInventory(authenticated=False)
     
+    fingerprint = _tunnel_list_fingerprint()
     try:
         result = subprocess.run(
-            [cloudflared_cmd, "tunnel", "list"],
+            [cloudflared_cmd, "tunnel", "list", "--output", "json"],
             capture_output=True,
             text=True,
-            check=True
+            check=False
         )
-        
-        tunnels = []
-        lines = result.stdout.split('\n')
-        for line in lines[1:]:  # Skip header
-            if line.strip():
-                parts = line.split()
-                if len(parts) >= 2:
-                    tunnel_name = parts[1]  # Second column is usually the name
-                    tunnels.append(tunnel_name)
-        
-        return tunnels
-    except subprocess.CalledProcessError:
-        return []
+    except OSError:
+        return TunnelInventory(authenticated=False)
+    
+    if result.returncode != 0:
+        return TunnelInventory(authenticated=False)
+    
+    tunnels = _parse_tunnel_list(result.stdout)
+    if fingerprint is not None:
+        _save_cached_tunnel_list(fingerprint, tunnels)
+    return TunnelInventory(authenticated=True, tunnel_ids=tunnels)
+
+
+@functools.lru_cache(maxsize=1)
+def _tunnel_inventory() -> TunnelInventory:
+    """
+    Tunnel inventory for `vibecode start`, looked up once per process.
+    
+    A list cached by a recent run is reused while the cloudflared login
+    state is unchanged, so most starts do not wait on the Cloudflare API.
+    """
+    if not _find_cloudflared():
+        return TunnelInventory(authenticated=False)
+    
+    fingerprint = _tunnel_list_fingerprint()
+    if fingerprint is not None:
+        cached = _load_cached_tunnel_list(fingerprint)
+        if cached is not None:
+            return TunnelInventory(authenticated=True, tunnel_ids=cached)
+    return _query_tunnel_inventory()
 
 
-def ensure_tunnel_exists(cloudflared_cmd: str, preferred_name: str = "vibecode") -> str:
-    """Ensure a vibecode tunnel exists, create if needed. Returns tunnel name."""
+def list_tunnels() -> list:
+    """List available named tunnels, always asking cloudflared for the current set."""
+    return list(_query_tunnel_inventory().tunnels)
+
+
+def ensure_tunnel_exists(cloudflared_cmd: str, preferred_name: str = "vibecode",
+                         reuse: bool = True) -> str:
+    """
+    Ensure a vibecode tunnel exists, create if needed. Returns tunnel name.
+    
+    With reuse=False a new tunnel is created even if one already exists.
+    """
     try:
-        # Check if user is logged in
-        result = subprocess.run(
-            [cloudflared_cmd, "tunnel", "list"],
-            capture_output=True,
-            text=True,
-            check=False  # Don't raise on error, we'll handle it
-        )
+        # A tunnel resolved by a recent start is reused without running cloudflared
+        saved_tunnel = load_resolved_tunnel() if reuse else None
+        if saved_tunnel:
+            print(f"✅ Using existing tunnel: {saved_tunnel}")
+            return saved_tunnel
         
-        if result.returncode != 0:
+        inventory = _tunnel_inventory()
+        if not inventory.authenticated:
             # User not logged in or other auth issue
             print("🔐 Cloudflare authentication required for persistent tunnels.")
             print("    Run: cloudflared tunnel login")
             print("    Then try again, or use --quick for temporary tunnel.")
             return None
         
-        # Parse existing tunnels
-        existing_tunnels = []
-        lines = result.stdout.split('\n')
-        for line in lines[1:]:  # Skip header
-            if line.strip():
-                parts = line.split()
-                if len(parts) >= 2:
-                    tunnel_name = parts[1]
-                    existing_tunnels.append(tunnel_name)
-        
         # Look for existing vibecode tunnel
-        vibecode_tunnels = [t for t in existing_tunnels if t.startswith('vibecode')]
-        if vibecode_tunnels:
+        vibecode_tunnels = [t for t in inventory.tunnels if t.startswith('vibecode')]
+        if vibecode_tunnels and reuse:
             print(f"✅ Using existing tunnel: {vibecode_tunnels[0]}")
+            save_resolved_tunnel(vibecode_tunnels[0], inventory.tunnel_ids.get(vibecode_tunnels[0]))
             return vibecode_tunnels[0]
         
         # Create new tunnel
-        import time
         timestamp = str(int(time.time()))[-6:]  # Last 6 digits of timestamp
         tunnel_name = f"{preferred_name}-{timestamp}"
         
         print(f"🚀 Creating persistent tunnel: {tunnel_name}")
         create_result = subprocess.run(
-            [cloudflared_cmd, "tunnel", "create", tunnel_name],
+            [cloudflared_cmd, "tunnel", "create", "--output", "json", tunnel_name],
             capture_output=True,
             text=True,
             check=False
@@ -430,8 +799,20 @@ def ensure_tunnel_exists(cloudflared_cmd: str, preferred_name: str = "vibecode")
             print(f"❌ Failed to create tunnel: {create_result.stderr}")
             return None
         
+        # The cached tunnel list no longer reflects reality
+        _tunnel_inventory.cache_clear()
+        
+        # cloudflared describes the new tunnel as JSON; keep its id alongside the name
+        try:
+            created = json.loads(create_result.stdout)
+            tunnel_name = created.get("name") or tunnel_name
+            tunnel_id = created.get("id")
+        except (ValueError, AttributeError):
+            tunnel_id = None
+        
         print(f"✅ Created tunnel: {tunnel_name}")
         print(f"🌐 Your stable domain: https://{tunnel_name}.cfargotunnel.com")
+        save_resolved_tunnel(tunnel_name, tunnel_id)
         return tunnel_name
         
     except Exception as e:
@@ -441,26 +822,14 @@ def ensure_tunnel_exists(cloudflared_cmd: str, preferred_name: str = "vibecode")
 
 def is_authenticated() -> bool:
     """Check if user is authenticated with Cloudflare."""
-    cloudflared_paths = [
-        "cloudflared",
-        "/opt/homebrew/bin/cloudflared", 
-        "/usr/local/bin/cloudflared",
-        "/usr/bin/cloudflared",
-    ]
-    
-    for path in cloudflared_paths:
-        try:
-            subprocess.run([path, "--version"], capture_output=True, check=True)
-            result = subprocess.run(
-                [path, "tunnel", "list"],
-                capture_output=True,
-                text=True,
-                check=False
-            )
-            return result.returncode == 0
-        except (subprocess.CalledProcessError, FileNotFoundError):
-            continue
+    # `cloudflared tunnel login` writes the origin certificate, so its presence
+    # answers the question without spawning cloudflared
+    if _find_origin_cert() is not None:
+        return True
     
+    # Diagnostics: ask cloudflared itself when the certificate is not where we expect it
+    if os.environ.get("VIBECODE_FORCE_AUTH_PROBE") == "1":
+        return _tunnel_inventory().authenticated
     return False
 
 
@@ -470,107 +839,136 @@ def start_quick_tunnel(local_url: str) -> Tuple[str, subprocess.Popen]:
     return start_tunnel(local_url, tunnel_name=None)
 
 
+# Guide banners are pre-built so each one goes out in a single write
+_SIMPLE_SETUP_GUIDE = """
+============================================================
+🚀 VibeCode One-Time Setup
+============================================================
+
+Get a persistent domain that never changes!
+
+💡 Two options:
+
+1️⃣  JUST WORKS (Quick tunnel)
+   vibecode start
+   → Gets random domain like: https://abc-123.trycloudflare.com
+   ✅ Zero setup  ❌ Changes every time
+
+2️⃣  PERSISTENT DOMAIN (Recommended)
+   Step 1: cloudflared tunnel login
+   Step 2: vibecode start
+   → Gets stable domain like: https://vibecode-123456.cfargotunnel.com
+   ✅ Same domain forever  ✅ Better for claude.ai
+
+🎯 For claude.ai, use option 2 (persistent domain)
+   Your URL won't change, so you only configure claude.ai once!
+
+📚 Need more details? Run: vibecode tunnel guide
+
+"""
+
+_TUNNEL_SETUP_GUIDE = """
+======================================================================
+🌩️  Setting up Persistent Cloudflare Tunnels
+======================================================================
+
+Persistent tunnels give you a stable domain that doesn't change between
+launches. Choose from two options:
+
+🔥 OPTION 1: Free Cloudflare Subdomain (Recommended)
+==================================================
+Get a free subdomain like: https://my-tunnel.cfargotunnel.com
+
+1. Create a Cloudflare account at https://dash.cloudflare.com
+
+2. Login to cloudflared:
+   cloudflared tunnel login
+
+3. Create a named tunnel:
+   cloudflared tunnel create my-mcp-server
+
+4. Use your tunnel (automatically gets .cfargotunnel.com subdomain):
+   vibecode start --tunnel my-mcp-server
+   # → https://my-mcp-server.cfargotunnel.com
+
+🏠 OPTION 2: Your Own Domain
+==============================
+Use your own domain like: https://mcp.yourdomain.com
+
+Follow steps 1-3 above, then:
+
+4. Add your domain to Cloudflare and create DNS record:
+   cloudflared tunnel route dns my-mcp-server mcp.yourdomain.com
+
+5. Use your custom domain:
+   vibecode start --tunnel my-mcp-server
+   # → https://mcp.yourdomain.com
+
+🔗 Documentation:
+   https://developers.cloudflare.com/cloudflare-one/connections/connect-apps
+
+💡 Benefits of persistent tunnels:
+   • Same domain every time
+   • Better security and monitoring
+   • No random URL changes
+   • Production-ready uptime guarantee
+   • Free Cloudflare subdomain available
+
+"""
+
+# Filled in with the public URL, plus the hint below for quick tunnels
+_INSTRUCTIONS_TEMPLATE = """
+============================================================
+🚀 VibeCode MCP Server Ready
+============================================================
+
+📡 URL: {url}
+
+🔗 Add to Claude.ai:
+  1. Copy the URL above
+  2. Add as MCP server (transport: sse)
+  3. Authentication handled automatically
+{hint}
+Press Ctrl+C to stop
+
+"""
+
+_QUICK_TUNNEL_HINT = """
+💡 For persistent domain: vibecode tunnel setup
+"""
+
+
 def print_simple_setup_guide() -> None:
     """Print simplified one-time setup guide."""
-    print("\n" + "="*60)
-    print("🚀 VibeCode One-Time Setup")
-    print("="*60)
-    print()
-    print("Get a persistent domain that never changes!")
-    print()
-    print("💡 Two options:")
-    print()
-    print("1️⃣  JUST WORKS (Quick tunnel)")
-    print("   vibecode start")
-    print("   → Gets random domain like: https://abc-123.trycloudflare.com")
-    print("   ✅ Zero setup  ❌ Changes every time")
-    print()
-    print("2️⃣  PERSISTENT DOMAIN (Recommended)")
-    print("   Step 1: cloudflared tunnel login")
-    print("   Step 2: vibecode start")
-    print("   → Gets stable domain like: https://vibecode-123456.cfargotunnel.com")
-    print("   ✅ Same domain forever  ✅ Better for claude.ai")
-    print()
-    print("🎯 For claude.ai, use option 2 (persistent domain)")
-    print("   Your URL won't change, so you only configure claude.ai once!")
-    print()
-    print("📚 Need more details? Run: vibecode tunnel guide")
-    print()
+    sys.stdout.write(_SIMPLE_SETUP_GUIDE)
 
 
 def print_tunnel_setup_guide() -> None:
     """Print guide for setting up persistent Cloudflare tunnels."""
-    print("\n" + "="*70)
-    print("🌩️  Setting up Persistent Cloudflare Tunnels")
-    print("="*70)
-    print()
-    print("Persistent tunnels give you a stable domain that doesn't change between")
-    print("launches. Choose from two options:")
-    print()
-    
-    print("🔥 OPTION 1: Free Cloudflare Subdomain (Recommended)")
-    print("="*50)
-    print("Get a free subdomain like: https://my-tunnel.cfargotunnel.com")
-    print()
-    print("1. Create a Cloudflare account at https://dash.cloudflare.com")
-    print()
-    print("2. Login to cloudflared:")
-    print("   cloudflared tunnel login")
-    print()
-    print("3. Create a named tunnel:")
-    print("   cloudflared tunnel create my-mcp-server")
-    print()
-    print("4. Use your tunnel (automatically gets .cfargotunnel.com subdomain):")
-    print("   vibecode start --tunnel my-mcp-server")
-    print("   # → https://my-mcp-server.cfargotunnel.com")
-    print()
-    
-    print("🏠 OPTION 2: Your Own Domain")
-    print("="*30)
-    print("Use your own domain like: https://mcp.yourdomain.com")
-    print()
-    print("Follow steps 1-3 above, then:")
-    print()
-    print("4. Add your domain to Cloudflare and create DNS record:")
-    print("   cloudflared tunnel route dns my-mcp-server mcp.yourdomain.com")
-    print()
-    print("5. Use your custom domain:")
-    print("   vibecode start --tunnel my-mcp-server")
-    print("   # → https://mcp.yourdomain.com")
-    print()
-    
-    print("🔗 Documentation:")
-    print("   https://developers.cloudflare.com/cloudflare-one/connections/connect-apps")
-    print()
-    print("💡 Benefits of persistent tunnels:")
-    print("   • Same domain every time")
-    print("   • Better security and monitoring") 
-    print("   • No random URL changes")
-    print("   • Production-ready uptime guarantee")
-    print("   • Free Cloudflare subdomain available")
-    print()
+    sys.stdout.write(_TUNNEL_SETUP_GUIDE)
 
 
 def print_instructions(url: str, enable_auth: bool = True) -> None:
     """Print setup instructions for the user."""
-    print("\n" + "="*60, file=sys.stderr)
-    print("🚀 VibeCode MCP Server Ready", file=sys.stderr)
-    print("="*60, file=sys.stderr)
-    print(f"\n📡 URL: {url}", file=sys.stderr)
-    
-    print("\n🔗 Add to Claude.ai:", file=sys.stderr)
-    print("  1. Copy the URL above", file=sys.stderr)
-    print("  2. Add as MCP server (transport: sse)", file=sys.stderr)
-    print("  3. Authentication handled automatically", file=sys.stderr)
-    
     # Check if this is a quick tunnel (random domain)
-    if "trycloudflare.com" in url:
-        print("\n💡 For persistent domain: vibecode tunnel setup", file=sys.stderr)
-    
-    print("\nPress Ctrl+C to stop\n", file=sys.stderr)
+    hint = _QUICK_TUNNEL_HINT if "trycloudflare.com" in url else ""
+    sys.stderr.write(_INSTRUCTIONS_TEMPLATE.format(url=url, hint=hint))
 
 
-def main() -> None:
+def _configure_cli_logging() -> None:
+    """Send CLI status messages to stderr as plain lines, like print() did."""
+    if _log.handlers:
+        return
+    handler = logging.StreamHandler(sys.stderr)
+    handler.setFormatter(logging.Formatter("%(message)s"))
+    _log.addHandler(handler)
+    _log.setLevel(logging.INFO)
+    # The server configures the root logger with a level prefix; keep CLI lines clean
+    _log.propagate = False
+
+
+def _build_parser() -> argparse.ArgumentParser:
+    """Build the command-line parser."""
     parser = argparse.ArgumentParser(
         prog="vibecode",
         description="Start MCP server for Claude-Code with automatic Cloudflare tunneling"
@@ -584,6 +982,10 @@ def main() -> None:
     start_parser.add_argument("--tunnel", type=str, help="Use specific named tunnel (optional)")
     start_parser.add_argument("--quick", action="store_true", help="Use quick tunnel (random domain) instead of persistent")
     start_parser.add_argument("--reset-uuid", action="store_true", help="Generate new session UUID (creates new MCP URL path)")
+    start_parser.add_argument("--tunnel-keepalive", type=int, default=100, help="Idle connections cloudflared keeps to the local server (default: 100)")
+    start_parser.add_argument("--verbose", action="store_true", help="Show all cloudflared output while the tunnel starts")
+    start_parser.add_argument("--tunnel-protocol", choices=["auto", "http2", "quic"], default="auto", help="Transport between cloudflared and Cloudflare's edge (default: auto)")
+    start_parser.add_argument("--no-reuse", action="store_true", help="Create a new persistent tunnel instead of reusing an existing one")
     
     # Add simple setup command for first-time users
     setup_parser = subparsers.add_parser("setup", help="One-time setup for persistent domains")
@@ -594,154 +996,189 @@ def main() -> None:
     
     list_parser = tunnel_subparsers.add_parser("list", help="List available named tunnels")
     guide_parser = tunnel_subparsers.add_parser("guide", help="Setup guide for creating named tunnels")
+    
+    return parser
 
+
+def main() -> None:
+    # `vibecode setup` takes no options, so answer it without building the parser
+    if sys.argv[1:] == ["setup"]:
+        print_simple_setup_guide()
+        return
+    
+    parser = _build_parser()
     args = parser.parse_args()
+    _configure_cli_logging()
     
     if args.command == "start":
-        # Check if cloudflared is installed (unless running local only)
-        if not args.no_tunnel and not check_cloudflared():
-            print("Error: cloudflared is not installed.", file=sys.stderr)
-            print("\nTo install cloudflared:", file=sys.stderr)
-            print("  - macOS: brew install cloudflared", file=sys.stderr)
-            print("  - Linux: See https://developers.cloudflare.com/cloudflare-one/connections/connect-apps/install-and-setup/installation", file=sys.stderr)
-            print("  - Or run with --no-tunnel for local-only mode", file=sys.stderr)
+        # Check if cloudflared is installed (unless running local only). Locating
+        # the binary is enough here: if it cannot run, starting the tunnel fails
+        # with an error of its own, so no `--version` process is spawned up front
+        if not args.no_tunnel and _find_cloudflared() is None:
+            _log.error(
+                "Error: cloudflared is not installed.\n"
+                "\nTo install cloudflared:\n"
+                "  - macOS: brew install cloudflared\n"
+                "  - Linux: See https://developers.cloudflare.com/cloudflare-one/connections/connect-apps/install-and-setup/installation\n"
+                "  - Or run with --no-tunnel for local-only mode"
+            )
             sys.exit(1)
         
         # Get or create persistent UUID path
         uuid_hex = get_or_create_uuid(reset=args.reset_uuid)
         uuid_path = f"/{uuid_hex}"
         
-        # Start the MCP server in a daemon thread
+        # The MCP server runs on the main thread; readiness is reported from a helper thread
         enable_auth = not args.no_auth
-        print(f"Starting MCP server on port {args.port}...", file=sys.stderr)
-        server_thread = threading.Thread(
-            target=run_mcp_server, 
-            args=(args.port, uuid_path, enable_auth), 
-            daemon=True
-        )
-        server_thread.start()
-        
-        # Give the server more time to start and become ready
-        print("Waiting for server to become ready...", file=sys.stderr)
-        time.sleep(3)
-        
-        # Verify the server is actually listening on the port
-        import socket
-        max_retries = 5
-        for i in range(max_retries):
-            try:
-                with socket.socket(socket.AF_INET, socket.SOCK_STREAM) as s:
-                    s.settimeout(1)
-                    result = s.connect_ex(('127.0.0.1', args.port))
-                    if result == 0:
-                        print(f"Server is ready on port {args.port}", file=sys.stderr)
-                        break
-                    else:
-                        print(f"Server not ready yet, retrying ({i+1}/{max_retries})...", file=sys.stderr)
-                        time.sleep(2)
-            except Exception as e:
-                print(f"Server check failed ({i+1}/{max_retries}): {e}", file=sys.stderr)
-                time.sleep(2)
-        else:
-            print("Warning: Could not verify server is ready, proceeding anyway...", file=sys.stderr)
+        server_ready = threading.Event()
         
         if args.no_tunnel:
             # Local-only mode
             local_url = f"http://localhost:{args.port}{uuid_path}"
-            print(f"\nMCP server running locally at: {local_url}")
-            print("Press Ctrl+C to stop.")
+            
+            def announce_local() -> None:
+                print(f"\nMCP server running locally at: {local_url}")
+                print("Press Ctrl+C to stop.")
+            
+            threading.Thread(
+                target=_announce_when_ready,
+                args=(args.port, server_ready, announce_local),
+                daemon=True
+            ).start()
+            
+            _log.info("Starting MCP server on port %d...", args.port)
             try:
-                # Keep running until interrupted
-                while True:
-                    time.sleep(1)
+                run_mcp_server(args.port, uuid_path, enable_auth, server_ready)
             except KeyboardInterrupt:
-                print("\nShutting down...")
-                sys.exit(0)
+                pass
+            print("\nShutting down...")
+            sys.exit(0)
         else:
             # Start Cloudflare tunnel
             # NOTE: cloudflared should tunnel to the base server URL, not the UUID path
             # The UUID path is handled by our server internally
             # Use 127.0.0.1 to match the server binding address
             base_local_url = f"http://127.0.0.1:{args.port}"
+            tunnel_options = {
+                "keepalive_connections": args.tunnel_keepalive,
+                "protocol": args.tunnel_protocol,
+                "verbose": args.verbose,
+            }
+            
+            # Load the server code while the tunnel comes up instead of after it
+            threading.Thread(target=_preload_server_stack, daemon=True).start()
+            
+            # Name of the persistent tunnel picked (and saved) by ensure_tunnel_exists, if any
+            resolved_tunnel = None
             
             try:
                 # Determine tunnel strategy
                 if hasattr(args, 'quick') and args.quick:
                     # User explicitly wants quick tunnel
-                    print("Starting quick tunnel...", file=sys.stderr)
-                    public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=None)
+                    _log.info("Starting quick tunnel...")
+                    public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=None, **tunnel_options)
                 elif hasattr(args, 'tunnel') and args.tunnel:
                     # User specified a specific tunnel
-                    print(f"Using tunnel: {args.tunnel}", file=sys.stderr)
-                    public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=args.tunnel)
+                    _log.info("Using tunnel: %s", args.tunnel)
+                    public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=args.tunnel, **tunnel_options)
                 else:
                     # Default: try to use persistent tunnel
-                    cloudflared_cmd = None
-                    for path in ["cloudflared", "/opt/homebrew/bin/cloudflared", "/usr/local/bin/cloudflared", "/usr/bin/cloudflared"]:
-                        try:
-                            subprocess.run([path, "--version"], capture_output=True, check=True)
-                            cloudflared_cmd = path
-                            break
-                        except (subprocess.CalledProcessError, FileNotFoundError):
-                            continue
-                    
+                    cloudflared_cmd = _find_cloudflared()
                     if cloudflared_cmd and is_authenticated():
                         # Try to use/create persistent tunnel
-                        tunnel_name = ensure_tunnel_exists(cloudflared_cmd)
+                        tunnel_name = ensure_tunnel_exists(cloudflared_cmd, reuse=not args.no_reuse)
                         if tunnel_name:
-                            print(f"Using persistent tunnel: {tunnel_name}", file=sys.stderr)
-                            public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=tunnel_name)
+                            resolved_tunnel = tunnel_name
+                            _log.info("Using persistent tunnel: %s", tunnel_name)
+                            public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=tunnel_name, **tunnel_options)
                         else:
                             # Fall back to quick tunnel
-                            print("Falling back to quick tunnel...", file=sys.stderr)
-                            public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=None)
+                            _log.info("Falling back to quick tunnel...")
+                            public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=None, **tunnel_options)
                     else:
                         # Not authenticated or no cloudflared, use quick tunnel
-                        print("Starting quick tunnel...", file=sys.stderr)
-                        public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=None)
+                        _log.info("Starting quick tunnel...")
+                        public_url, tunnel_process = start_tunnel(base_local_url, tunnel_name=None, **tunnel_options)
                         
             except Exception as e:
                 error_msg = str(e)
-                print(f"Error starting Cloudflare tunnel: {error_msg}", file=sys.stderr)
+                _log.error("Error starting Cloudflare tunnel: %s", error_msg)
                 
                 # Provide helpful guidance based on error type
                 if "rate limited" in error_msg.lower():
-                    print("\n🚨 Cloudflare Quick Tunnels Rate Limit Reached", file=sys.stderr)
-                    print("   Quick tunnels have usage limits and may be temporarily unavailable.", file=sys.stderr)
-                    print("\n💡 Solutions:", file=sys.stderr)
-                    print("   1. Wait a few minutes and try again", file=sys.stderr)
-                    print("   2. Set up a persistent tunnel (recommended):", file=sys.stderr)
-                    print("      cloudflared tunnel login", file=sys.stderr)
-                    print("      vibecode start", file=sys.stderr)
-                    print("   3. Use local mode for development:", file=sys.stderr)
-                    print("      vibecode start --no-tunnel", file=sys.stderr)
+                    _log.error(
+                        "\n🚨 Cloudflare Quick Tunnels Rate Limit Reached\n"
+                        "   Quick tunnels have usage limits and may be temporarily unavailable.\n"
+                        "\n💡 Solutions:\n"
+                        "   1. Wait a few minutes and try again\n"
+                        "   2. Set up a persistent tunnel (recommended):\n"
+                        "      cloudflared tunnel login\n"
+                        "      vibecode start\n"
+                        "   3. Use local mode for development:\n"
+                        "      vibecode start --no-tunnel"
+                    )
                 elif "not found" in error_msg.lower() and "cloudflared" in error_msg.lower():
-                    print("\n💡 Install cloudflared:", file=sys.stderr)
-                    print("   macOS: brew install cloudflared", file=sys.stderr)
-                    print("   Or visit: https://developers.cloudflare.com/cloudflare-one/connections/connect-apps/install-and-setup/installation", file=sys.stderr)
+                    _log.error(
+                        "\n💡 Install cloudflared:\n"
+                        "   macOS: brew install cloudflared\n"
+                        "   Or visit: https://developers.cloudflare.com/cloudflare-one/connections/connect-apps/install-and-setup/installation"
+                    )
                 else:
-                    print("\n💡 Try these alternatives:", file=sys.stderr)
-                    print("   • Local mode: vibecode start --no-tunnel", file=sys.stderr)
-                    print("   • Setup guide: vibecode setup", file=sys.stderr)
+                    _log.error(
+                        "\n💡 Try these alternatives:\n"
+                        "   • Local mode: vibecode start --no-tunnel\n"
+                        "   • Setup guide: vibecode setup"
+                    )
                 
                 sys.exit(1)
             
             full_public_url = f"{public_url}{uuid_path}"
             
-            # Print URL to stdout for easy capture
-            print(full_public_url)
+            def announce_public() -> None:
+                # Print URL to stdout for easy capture
+                print(full_public_url)
+                
+                # Print instructions to stderr
+                print_instructions(full_public_url, enable_auth)
             
-            # Print instructions to stderr
-            print_instructions(full_public_url, enable_auth)
+            # Only hand out the URL once the server behind the tunnel is listening
+            threading.Thread(
+                target=_announce_when_ready,
+                args=(args.port, server_ready, announce_public),
+                daemon=True
+            ).start()
             
+            stopping = threading.Event()
+            tunnel_died = threading.Event()
             try:
-                # Wait for tunnel process to end (until user interrupts)
-                tunnel_process.wait()
+                # Started inside the try: a tunnel that fails at once interrupts
+                # main before the server is even up
+                threading.Thread(
+                    target=_supervise_tunnel,
+                    args=(tunnel_process, stopping, tunnel_died),
+                    daemon=True
+                ).start()
+                
+                _log.info("Starting MCP server on port %d...", args.port)
+                run_mcp_server(args.port, uuid_path, enable_auth, server_ready)
             except KeyboardInterrupt:
+                pass
+            finally:
+                stopping.set()
                 print("\nShutting down...")
                 tunnel_process.terminate()
-                tunnel_process.wait(timeout=5)
-                sys.exit(0)
+                try:
+                    tunnel_process.wait(timeout=5)
+                except subprocess.TimeoutExpired:
+                    tunnel_process.kill()
+            # A tunnel that died on its own is a failure, even though the server stopped cleanly
+            if tunnel_died.is_set():
+                if resolved_tunnel and tunnel_process.returncode:
+                    # The saved tunnel could not be run (e.g. deleted on Cloudflare's side);
+                    # don't hand it to the next start
+                    forget_resolved_tunnel()
+                sys.exit(1)
+            sys.exit(0)
     
     elif args.command == "setup":
         print_simple_setup_guide()
@@ -1,10 +1,8 @@
 """Combined OAuth and MCP server implementation."""
 
-# Suppress warnings at module level
-import warnings
-import os
-warnings.simplefilter("ignore")
-os.environ["PYDANTIC_DISABLE_WARNINGS"] = "1"
+# Silence warnings raised by the server dependencies, before any of them are imported
+from .warning_filters import silence_dependency_warnings
+silence_dependency_warnings()
 
 import asyncio
 import json
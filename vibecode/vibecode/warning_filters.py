@@ -0,0 +1,14 @@
+"""Warning filters for the third-party server dependencies."""
+
+import os
+import warnings
+
+# Modules whose deprecation and user warnings are noise for VibeCode users
+_NOISY_DEPENDENCIES = r"(pydantic|mcp|mcp_claude_code|fastapi|starlette|uvicorn|websockets)(\.|$)"
+
+
+def silence_dependency_warnings():
+    """Hide warnings raised by the server dependencies; call before importing them."""
+    warnings.filterwarnings("ignore", category=DeprecationWarning, module=_NOISY_DEPENDENCIES)
+    warnings.filterwarnings("ignore", category=UserWarning, module=_NOISY_DEPENDENCIES)
+    os.environ["PYDANTIC_DISABLE_WARNINGS"] = "1"